@@ -6,17 +6,52 @@
 ║         Compacta repositorios Git com seguranca total         ║
 ║                       Python 3.12+                            ║
 ╚═══════════════════════════════════════════════════════════════╝
+
+Uso como biblioteca:
+
+    from casa_git_compact import CasaGitCompactApp, CompactConfig
+
+    app = CasaGitCompactApp(CompactConfig(skip_remote_check=True))
+    for repo in app.iter_compact(["/repos/a", "/repos/b"]):
+        print(repo.path, repo.status.name, repo.size_saved)
+
+Modulos usados so por modos especificos (fila, auto-tune, CLI, pty) sao
+importados sob demanda para manter o import barato.
 """
 
-import argparse
+import heapq
+import json
 import logging
+import os
+import re
 import subprocess
 import shutil
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum, auto
 from pathlib import Path
 
+__all__ = [
+    "BlobAnalyzer",
+    "BlobReport",
+    "CasaGitCompactApp",
+    "CompactAborted",
+    "CompactConfig",
+    "CompactHooks",
+    "CompactPhase",
+    "CompactSummary",
+    "CompressionSettings",
+    "GitRepository",
+    "HookError",
+    "RepoStatus",
+    "main",
+]
+
 
 # ============================================================================
 # ENUMS E DATACLASSES
@@ -33,6 +68,24 @@ class RepoStatus(Enum):
     RESTORED = auto()
 
 
+class CompactPhase(Enum):
+    """Fases da compactacao de um repositorio, na ordem de execucao."""
+    AUTO_COMMIT = auto()
+    VALIDATE = auto()
+    BACKUP = auto()
+    CONFIGURE = auto()
+    COMPACT = auto()
+    VERIFY = auto()
+
+
+@dataclass(frozen=True)
+class CompressionSettings:
+    """Parametros de compressao usados no repack."""
+    level: int = 9
+    window: int = 250
+    depth: int = 250
+
+
 @dataclass
 class GitRepository:
     """Representa um repositorio Git."""
@@ -45,6 +98,7 @@ class GitRepository:
     branch_count: int = 0
     tag_count: int = 0
     auto_committed: bool = False
+    compression: CompressionSettings | None = None
 
     @property
     def git_dir(self) -> Path:
@@ -55,10 +109,23 @@ class GitRepository:
         return self.size_before - self.size_after
 
 
+@dataclass
+class CompactHooks:
+    """Callbacks chamados antes e depois de cada fase da compactacao.
+
+    Recebem o repositorio e a fase. O `after_phase` e chamado mesmo se a
+    fase falhar. Uma excecao lancada por um hook deixa so o repositorio
+    atual FAILED, sem restaurar o backup; para interromper de proposito,
+    lance `CompactAborted`.
+    """
+    before_phase: Callable[["GitRepository", CompactPhase], None] | None = None
+    after_phase: Callable[["GitRepository", CompactPhase], None] | None = None
+
+
 @dataclass
 class CompactConfig:
     """Configuracoes da compactacao."""
-    root_path: Path
+    root_path: Path = field(default_factory=Path.cwd)
     backup_path: Path | None = None
     keep_backup: bool = False
     dry_run: bool = False
@@ -66,6 +133,36 @@ class CompactConfig:
     exclude_patterns: list[str] = field(default_factory=list)
     log_file: Path | None = None
     auto_commit: bool = True
+    queue_path: Path | None = None
+    worker: bool = False
+    local_workers: int = 0
+    lease_seconds: int = 900
+    spawned_worker: bool = False
+    progress: bool = False
+    stall_seconds: int = 300
+    analyze: bool = False
+    analyze_top: int = 20
+    blob_threshold: int = 1024 * 1024
+    auto_tune: bool = False
+    retune: bool = False
+    cpu_budget: float = 600.0
+
+
+@dataclass
+class BlobReport:
+    """Relatorio de blobs grandes de um repositorio."""
+    path: Path
+    total_blobs: int = 0
+    total_blob_bytes: int = 0
+    total_disk_bytes: int = 0
+    top_blobs: list[tuple[int, int, str, str]] = field(default_factory=list)
+    top_paths: list[tuple[str, int, int, int]] = field(default_factory=list)
+    top_extensions: list[tuple[str, int, int, int]] = field(default_factory=list)
+    lfs_extensions: list[str] = field(default_factory=list)
+    lfs_savings: int = 0
+    partial_clone_savings: int = 0
+    threshold: int = 0
+    error_message: str = ""
 
 
 @dataclass
@@ -84,14 +181,41 @@ class CompactSummary:
     def total_saved(self) -> int:
         return self.total_size_before - self.total_size_after
 
+    def add(self, repo: GitRepository) -> None:
+        """Contabiliza o resultado de um repositorio no resumo."""
+        self.total_size_before += repo.size_before
+        self.total_size_after += repo.size_after
+
+        if repo.auto_committed:
+            self.auto_committed += 1
+
+        match repo.status:
+            case RepoStatus.COMPACTED:
+                self.compacted += 1
+            case RepoStatus.RESTORED:
+                self.restored += 1
+            case RepoStatus.FAILED:
+                self.failed += 1
+            case _:
+                self.skipped += 1
+
 
 # ============================================================================
 # GIT COMMAND RUNNER
 # ============================================================================
 
+ProgressCallback = Callable[[str, int | None, int], None]
+
+
 class GitCommandRunner:
     """Executa comandos Git com tratamento de erros."""
 
+    # Ex.: "Compressing objects:  45% (450/1000)" ou "Enumerating objects: 1234"
+    PROGRESS_PATTERN = re.compile(
+        r"(?P<phase>[A-Z][a-z]+(?: [a-z]+)*):\s+(?:(?P<percent>\d+)% \()?(?P<done>\d+)"
+    )
+    STDERR_LINES = 20
+
     def __init__(self, repo_path: Path):
         self.repo_path = repo_path
 
@@ -106,6 +230,79 @@ class GitCommandRunner:
             timeout=timeout
         )
 
+    def run_streaming(
+        self,
+        *args: str,
+        on_progress: ProgressCallback,
+        timeout: int = 600
+    ) -> subprocess.CompletedProcess:
+        """Executa um comando git repassando o progresso do stderr.
+
+        `repack` e `gc` so emitem progresso quando o stderr e um terminal,
+        entao um pseudo-terminal e usado quando disponivel (POSIX). O stderr
+        devolvido no resultado traz so as ultimas `STDERR_LINES` linhas que
+        nao sao de progresso, para que as mensagens de erro fiquem legiveis.
+        """
+        try:
+            import pty
+        except ImportError:  # Windows
+            pty = None
+
+        cmd = ["git", "-C", str(self.repo_path), *args]
+        if pty:
+            master, slave = pty.openpty()
+            proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=slave)
+            os.close(slave)
+        else:
+            proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            master = proc.stderr.fileno()
+
+        stderr: list[str] = []
+        reader = threading.Thread(
+            target=self._read_progress, args=(master, stderr, on_progress), daemon=True
+        )
+        reader.start()
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            reader.join()
+            if pty:
+                os.close(master)
+            else:
+                proc.stderr.close()
+
+        return subprocess.CompletedProcess(cmd, proc.returncode, "", "\n".join(stderr))
+
+    def _read_progress(self, fd: int, stderr: list[str], on_progress: ProgressCallback) -> None:
+        """Le o stderr em blocos, reporta o progresso e guarda as demais linhas."""
+        pending = ""
+        while True:
+            try:
+                chunk = os.read(fd, 4096)
+            except OSError:  # pty fechado pelo processo filho
+                chunk = b""
+            if not chunk:
+                lines, pending = [pending], ""
+            else:
+                pending += chunk.decode("utf-8", errors="replace")
+                *lines, pending = re.split(r"[\r\n]", pending)
+
+            for line in lines:
+                match = self.PROGRESS_PATTERN.search(line)
+                if match:
+                    percent = match.group("percent")
+                    on_progress(match.group("phase"), int(percent) if percent else None, int(match.group("done")))
+                elif line.strip():
+                    stderr.append(line.strip())
+                    del stderr[:-self.STDERR_LINES]
+
+            if not chunk:
+                break
+
     def is_clean(self) -> bool:
         """Verifica se o repositorio esta limpo (sem alteracoes pendentes)."""
         result = self.run("status", "--porcelain", check=False)
@@ -146,18 +343,23 @@ class GitCommandRunner:
         tags = result.stdout.strip()
         return len(tags.split("\n")) if tags else 0
 
-    def create_bundle(self, bundle_path: Path) -> bool:
+    def create_bundle(self, bundle_path: Path, on_progress: ProgressCallback | None = None) -> bool:
         """Cria um bundle completo do repositorio."""
-        result = self.run("bundle", "create", str(bundle_path), "--all", check=False)
+        if on_progress:
+            result = self.run_streaming(
+                "bundle", "create", "--progress", str(bundle_path), "--all", on_progress=on_progress
+            )
+        else:
+            result = self.run("bundle", "create", str(bundle_path), "--all", check=False)
         return result.returncode == 0
 
-    def apply_compression_config(self) -> bool:
-        """Aplica configuracoes de compressao maxima."""
+    def apply_compression_config(self, settings: CompressionSettings = CompressionSettings()) -> bool:
+        """Aplica configuracoes de compressao (padrao: maxima)."""
         configs = [
-            ("core.compression", "9"),
-            ("pack.compression", "9"),
-            ("gc.aggressiveDepth", "250"),
-            ("gc.aggressiveWindow", "250"),
+            ("core.compression", str(settings.level)),
+            ("pack.compression", str(settings.level)),
+            ("gc.aggressiveDepth", str(settings.depth)),
+            ("gc.aggressiveWindow", str(settings.window)),
         ]
         for key, value in configs:
             result = self.run("config", "--local", key, value, check=False)
@@ -165,19 +367,98 @@ class GitCommandRunner:
                 return False
         return True
 
-    def compact(self) -> tuple[bool, str]:
+    def compact(
+        self,
+        settings: CompressionSettings = CompressionSettings(),
+        on_progress: ProgressCallback | None = None
+    ) -> tuple[bool, str]:
         """Executa comandos de compactacao."""
         commands = [
             ("reflog", "expire", "--expire=now", "--all"),
-            ("repack", "-a", "-d", "-f", "--depth=250", "--window=250"),
+            ("repack", "-a", "-d", "-f", f"--depth={settings.depth}", f"--window={settings.window}"),
             ("gc", "--aggressive", "--prune=now"),
         ]
         for cmd in commands:
-            result = self.run(*cmd, check=False)
+            if on_progress and cmd[0] != "reflog":
+                result = self.run_streaming(*cmd, on_progress=on_progress)
+            else:
+                result = self.run(*cmd, check=False)
             if result.returncode != 0:
                 return False, f"Falha em 'git {' '.join(cmd)}': {result.stderr}"
         return True, ""
 
+    def sample_objects(self, sample_path: Path, limit: int, seed: int = 0) -> tuple[int, int]:
+        """Amostra objetos de `rev-list --objects --all` para `sample_path`.
+
+        Usa reservoir sampling sobre a saida em streaming, entao a memoria
+        fica limitada a `limit` linhas. As linhas sao tratadas como bytes,
+        pois os caminhos podem ter qualquer codificacao. Retorna (total de
+        objetos, amostrados).
+        """
+        import random
+
+        rng = random.Random(seed)
+        sample: list[bytes] = []
+        total = 0
+        cmd = ["git", "-C", str(self.repo_path), "rev-list", "--objects", "--all"]
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+            for line in proc.stdout:
+                total += 1
+                if len(sample) < limit:
+                    sample.append(line)
+                else:
+                    index = rng.randrange(total)
+                    if index < limit:
+                        sample[index] = line
+        if proc.returncode != 0:
+            return 0, 0
+        sample_path.write_bytes(b"".join(sample))
+        return total, len(sample)
+
+    def trial_pack(self, sample_path: Path, settings: CompressionSettings) -> tuple[int, float] | None:
+        """Empacota a amostra em memoria e retorna (bytes, segundos de CPU).
+
+        Objetos e deltas existentes nao sao reaproveitados (como no
+        `repack -f`), senao a compressao e a janela nao teriam efeito. O
+        `pack-objects` roda com uma unica thread, entao o tempo de relogio
+        medido aproxima o custo de CPU em qualquer plataforma.
+        """
+        cmd = [
+            "git", "-C", str(self.repo_path),
+            "-c", f"pack.compression={settings.level}",
+            "pack-objects", "--stdout", "-q", "--threads=1",
+            "--no-reuse-object", "--no-reuse-delta",
+            f"--window={settings.window}", f"--depth={settings.depth}",
+        ]
+        size = 0
+        start = time.perf_counter()
+        with open(sample_path, "rb") as stdin:
+            with subprocess.Popen(cmd, stdin=stdin, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+                while chunk := proc.stdout.read(1024 * 1024):
+                    size += len(chunk)
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            return None
+        return size, elapsed
+
+    def read_tuned_compression(self) -> CompressionSettings | None:
+        """Le as configuracoes escolhidas por um auto-tune anterior."""
+        values = []
+        for key in ("level", "window", "depth"):
+            result = self.run("config", "--local", "--get", f"casagitcompact.{key}", check=False)
+            if result.returncode != 0 or not result.stdout.strip().isdigit():
+                return None
+            values.append(int(result.stdout.strip()))
+        return CompressionSettings(*values)
+
+    def save_tuned_compression(self, settings: CompressionSettings) -> bool:
+        """Grava as configuracoes escolhidas para reuso em execucoes futuras."""
+        for key, value in (("level", settings.level), ("window", settings.window), ("depth", settings.depth)):
+            result = self.run("config", "--local", f"casagitcompact.{key}", str(value), check=False)
+            if result.returncode != 0:
+                return False
+        return True
+
     def auto_commit(self) -> tuple[bool, str]:
         """Faz auto-commit de todas as alteracoes pendentes."""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -231,6 +512,203 @@ class RepositoryScanner:
         return False
 
 
+# ============================================================================
+# COMPRESSION TUNER
+# ============================================================================
+
+class CompressionTuner:
+    """Escolhe a compressao de cada repositorio com repacks de teste.
+
+    Uma amostra de objetos e empacotada com cada candidato; o ganho e medido
+    contra `BASELINE` (sem compressao, nunca escolhido) e o custo e
+    extrapolado para o total de objetos. Vence o candidato mais caro que
+    ainda cabe no orcamento de CPU e que economiza ao menos `MIN_GAIN_RATIO`
+    a mais que o anterior; o primeiro candidato e o piso.
+    """
+
+    BASELINE = CompressionSettings(level=0, window=0, depth=0)
+    CANDIDATES = [
+        CompressionSettings(level=1, window=10, depth=10),
+        CompressionSettings(level=6, window=50, depth=50),
+        CompressionSettings(level=9, window=250, depth=250),
+    ]
+    SAMPLE_SIZE = 2000
+    MIN_GAIN_RATIO = 0.01
+
+    def __init__(self, cpu_budget: float = 600.0, retune: bool = False):
+        self.cpu_budget = cpu_budget
+        self.retune = retune
+
+    def tune(self, git: GitCommandRunner) -> CompressionSettings:
+        """Retorna as configuracoes gravadas ou mede e grava novas.
+
+        Se a medicao falhar, usa o padrao (compressao maxima) sem gravar,
+        para que a proxima execucao tente medir de novo.
+        """
+        if not self.retune:
+            saved = git.read_tuned_compression()
+            if saved:
+                return saved
+
+        settings = self._measure(git)
+        if settings is None:
+            return CompressionSettings()
+        git.save_tuned_compression(settings)
+        return settings
+
+    def _measure(self, git: GitCommandRunner) -> CompressionSettings | None:
+        """Executa os repacks de teste e escolhe o melhor candidato."""
+        import tempfile
+
+        with tempfile.TemporaryDirectory(prefix="casa_git_compact_") as tmp:
+            sample_path = Path(tmp) / "sample.txt"
+            total, sampled = git.sample_objects(sample_path, self.SAMPLE_SIZE)
+            if sampled == 0:
+                return None
+
+            scale = total / sampled
+            trials = []
+            for candidate in [self.BASELINE, *self.CANDIDATES]:
+                trial = git.trial_pack(sample_path, candidate)
+                if trial is None:
+                    return None
+                size, seconds = trial
+                trials.append((candidate, size, seconds * scale))
+
+        baseline = trials[0][1]
+        best, best_size, _ = trials[1]
+        for candidate, size, cpu_seconds in trials[2:]:
+            if cpu_seconds > self.cpu_budget:
+                break
+            if best_size - size >= baseline * self.MIN_GAIN_RATIO:
+                best, best_size = candidate, size
+        return best
+
+
+# ============================================================================
+# BLOB ANALYZER
+# ============================================================================
+
+class _BoundedCounter:
+    """Agrega (quantidade, bytes, bytes em disco) por chave com memoria limitada.
+
+    Ao passar de `capacity` chaves, descarta metade das menores por bytes
+    em disco. Os maiores agregados sobrevivem; os valores sao aproximados
+    apenas quando houve descarte (`pruned`).
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: dict[str, list[int]] = {}
+        self.pruned = False
+
+    def add(self, key: str, size: int, disk: int) -> None:
+        entry = self.counts.get(key)
+        if entry is None:
+            if len(self.counts) >= self.capacity:
+                self._prune()
+            self.counts[key] = [1, size, disk]
+        else:
+            entry[0] += 1
+            entry[1] += size
+            entry[2] += disk
+
+    def top(self, n: int) -> list[tuple[str, int, int, int]]:
+        """Retorna as `n` chaves com mais bytes em disco: (chave, qtd, bytes, disco)."""
+        items = heapq.nlargest(n, self.counts.items(), key=lambda item: item[1][2])
+        return [(key, count, size, disk) for key, (count, size, disk) in items]
+
+    def _prune(self) -> None:
+        keep = heapq.nlargest(self.capacity // 2, self.counts.items(), key=lambda item: item[1][2])
+        self.counts = dict(keep)
+        self.pruned = True
+
+
+class BlobAnalyzer:
+    """Analisa o que ocupa espaco no historico de um repositorio.
+
+    Faz uma unica passada em streaming: `rev-list --objects --all` alimenta
+    `cat-file --batch-check`, que devolve tipo, tamanho e caminho de cada
+    objeto alcancavel. A memoria fica limitada ao top-N de blobs e aos
+    agregados por caminho e extensao.
+    """
+
+    PATH_CAPACITY = 50_000
+    EXTENSION_CAPACITY = 5_000
+    NO_EXTENSION = "(sem extensao)"
+
+    def __init__(self, top: int = 20, threshold: int = 1024 * 1024):
+        self.top = top
+        self.threshold = threshold
+
+    def analyze(self, repo: GitRepository) -> BlobReport:
+        """Gera o relatorio de blobs do repositorio."""
+        report = BlobReport(path=repo.path, threshold=self.threshold)
+        top_blobs: list[tuple[int, int, str, str]] = []
+        by_path = _BoundedCounter(self.PATH_CAPACITY)
+        by_extension = _BoundedCounter(self.EXTENSION_CAPACITY)
+
+        git = ["git", "-C", str(repo.path)]
+        rev_list = subprocess.Popen(
+            [*git, "rev-list", "--objects", "--all"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        cat_file = subprocess.Popen(
+            [*git, "cat-file",
+             "--batch-check=%(objectname) %(objecttype) %(objectsize) %(objectsize:disk) %(rest)"],
+            stdin=rev_list.stdout, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding="utf-8", errors="replace"
+        )
+        rev_list.stdout.close()
+
+        with cat_file:
+            for line in cat_file.stdout:
+                parts = line.rstrip("\n").split(" ", 4)
+                if len(parts) < 4 or parts[1] != "blob":
+                    continue
+                sha, size, disk = parts[0], int(parts[2]), int(parts[3])
+                path = parts[4] if len(parts) == 5 else ""
+
+                report.total_blobs += 1
+                report.total_blob_bytes += size
+                report.total_disk_bytes += disk
+                if size >= self.threshold:
+                    report.partial_clone_savings += disk
+
+                blob = (size, disk, sha, path)
+                if len(top_blobs) < self.top:
+                    heapq.heappush(top_blobs, blob)
+                elif top_blobs and blob > top_blobs[0]:
+                    heapq.heapreplace(top_blobs, blob)
+
+                by_path.add(path, size, disk)
+                by_extension.add(self._extension(path), size, disk)
+
+        if rev_list.wait() != 0 or cat_file.returncode != 0:
+            report.error_message = "Falha ao listar objetos do repositorio"
+            return report
+
+        report.top_blobs = sorted(top_blobs, reverse=True)
+        report.top_paths = by_path.top(self.top)
+        report.top_extensions = by_extension.top(self.top)
+        if by_path.pruned or by_extension.pruned:
+            report.error_message = "Agregados aproximados (muitos caminhos distintos)"
+
+        # git lfs migrate move todas as versoes de uma extensao; sugere so as
+        # extensoes cujo blob medio ja passa do limite.
+        for ext, count, size, disk in report.top_extensions:
+            if ext != self.NO_EXTENSION and size / count >= self.threshold:
+                report.lfs_extensions.append(ext)
+                report.lfs_savings += disk
+
+        return report
+
+    def _extension(self, path: str) -> str:
+        """Retorna a extensao do caminho em minusculas."""
+        ext = os.path.splitext(path)[1].lower()
+        return ext or self.NO_EXTENSION
+
+
 # ============================================================================
 # BACKUP MANAGER
 # ============================================================================
@@ -243,7 +721,7 @@ class BackupManager:
     def __init__(self, backup_root: Path | None = None):
         self.backup_root = backup_root
 
-    def create_backup(self, repo: GitRepository) -> Path | None:
+    def create_backup(self, repo: GitRepository, on_progress: ProgressCallback | None = None) -> Path | None:
         """Cria backup do repositorio usando git bundle."""
         backup_dir = self._get_backup_dir(repo)
         backup_dir.mkdir(parents=True, exist_ok=True)
@@ -253,7 +731,7 @@ class BackupManager:
         bundle_path = backup_dir / bundle_name
 
         git = GitCommandRunner(repo.path)
-        if git.create_bundle(bundle_path):
+        if git.create_bundle(bundle_path, on_progress):
             return bundle_path
         return None
 
@@ -362,6 +840,18 @@ class RepositoryValidator:
 # COMPACTOR
 # ============================================================================
 
+class CompactAborted(Exception):
+    """Interrompe a compactacao sem restaurar o backup (ex.: lease perdido).
+
+    E a unica excecao que um hook pode lancar de proposito para parar o
+    repositorio; ela atravessa `_phase` sem ser embrulhada.
+    """
+
+
+class HookError(Exception):
+    """Falha inesperada em um hook; nao indica problema no repositorio."""
+
+
 class Compactor:
     """Executa a compactacao de um repositorio."""
 
@@ -370,12 +860,18 @@ class Compactor:
         backup_manager: BackupManager,
         keep_backup: bool = False,
         dry_run: bool = False,
-        auto_commit: bool = True
+        auto_commit: bool = True,
+        tuner: CompressionTuner | None = None,
+        progress: "ProgressTracker | None" = None,
+        hooks: CompactHooks | None = None
     ):
         self.backup_manager = backup_manager
         self.keep_backup = keep_backup
         self.dry_run = dry_run
         self.auto_commit = auto_commit
+        self.tuner = tuner
+        self.progress = progress
+        self.hooks = hooks or CompactHooks()
 
     def compact(self, repo: GitRepository, skip_remote_check: bool = False) -> GitRepository:
         """Compacta um repositorio com todas as verificacoes de seguranca."""
@@ -384,65 +880,89 @@ class Compactor:
 
         repo.size_before = self._get_git_size(repo)
 
-        # 0. Auto-commit se houver alteracoes pendentes
-        if git.has_changes():
-            if self.auto_commit:
-                if self.dry_run:
-                    repo.auto_committed = True
-                else:
-                    success, message = git.auto_commit()
-                    if success:
-                        repo.auto_committed = True
-                    else:
-                        repo.status = RepoStatus.FAILED
-                        repo.error_message = f"Falha no auto-commit: {message}"
-                        repo.size_after = repo.size_before
-                        return repo
-
-        # 1. Validacao pre-compactacao
-        can_compact, status, message = validator.validate_pre_compact(skip_remote_check)
-        if not can_compact:
-            repo.status = status
-            repo.error_message = message
-            repo.size_after = repo.size_before
-            return repo
-
-        # 2. Salvar metricas originais
-        repo.commit_count = git.count_commits()
-        repo.branch_count = git.count_branches()
-        repo.tag_count = git.count_tags()
-
-        # Modo dry-run: apenas simula
-        if self.dry_run:
-            repo.status = RepoStatus.COMPACTED
-            repo.size_after = repo.size_before
-            repo.error_message = "[DRY-RUN] Simulacao apenas"
-            return repo
+        try:
+            # 0. Auto-commit se houver alteracoes pendentes
+            with self._phase(repo, CompactPhase.AUTO_COMMIT):
+                if git.has_changes():
+                    if self.auto_commit:
+                        if self.dry_run:
+                            repo.auto_committed = True
+                        else:
+                            success, message = git.auto_commit()
+                            if success:
+                                repo.auto_committed = True
+                            else:
+                                repo.status = RepoStatus.FAILED
+                                repo.error_message = f"Falha no auto-commit: {message}"
+                                repo.size_after = repo.size_before
+                                return repo
+
+            with self._phase(repo, CompactPhase.VALIDATE):
+                # 1. Validacao pre-compactacao
+                can_compact, status, message = validator.validate_pre_compact(skip_remote_check)
+                if not can_compact:
+                    repo.status = status
+                    repo.error_message = message
+                    repo.size_after = repo.size_before
+                    return repo
+
+                # 2. Salvar metricas originais
+                repo.commit_count = git.count_commits()
+                repo.branch_count = git.count_branches()
+                repo.tag_count = git.count_tags()
+
+            # Modo dry-run: apenas simula
+            if self.dry_run:
+                repo.status = RepoStatus.COMPACTED
+                repo.size_after = repo.size_before
+                repo.error_message = "[DRY-RUN] Simulacao apenas"
+                return repo
+
+            # 3. Criar backup
+            on_progress = self.progress.update if self.progress else None
+            watching = self.progress.watching if self.progress else nullcontext
+            with self._phase(repo, CompactPhase.BACKUP):
+                with watching():
+                    bundle_path = self.backup_manager.create_backup(repo, on_progress)
+                if not bundle_path:
+                    repo.status = RepoStatus.FAILED
+                    repo.error_message = "Falha ao criar backup"
+                    repo.size_after = repo.size_before
+                    return repo
 
-        # 3. Criar backup
-        bundle_path = self.backup_manager.create_backup(repo)
-        if not bundle_path:
+        except Exception as e:
+            # Nada foi alterado ainda (exceto um possivel auto-commit)
             repo.status = RepoStatus.FAILED
-            repo.error_message = "Falha ao criar backup"
+            if isinstance(e, CompactAborted):
+                repo.error_message = f"Interrompido: {e}"
+            else:
+                repo.error_message = str(e) or type(e).__name__
             repo.size_after = repo.size_before
             return repo
 
         try:
             # 4. Aplicar configuracoes
-            if not git.apply_compression_config():
-                raise Exception("Falha ao aplicar configuracoes de compressao")
+            with self._phase(repo, CompactPhase.CONFIGURE):
+                settings = self.tuner.tune(git) if self.tuner else CompressionSettings()
+                if self.tuner:
+                    repo.compression = settings
+                if not git.apply_compression_config(settings):
+                    raise Exception("Falha ao aplicar configuracoes de compressao")
 
             # 5. Executar compactacao
-            success, error = git.compact()
-            if not success:
-                raise Exception(error)
+            with self._phase(repo, CompactPhase.COMPACT):
+                with watching():
+                    success, error = git.compact(settings, on_progress)
+                if not success:
+                    raise Exception(error)
 
             # 6. Validar pos-compactacao
-            is_valid, validation_error = validator.validate_post_compact(
-                repo.commit_count, repo.branch_count, repo.tag_count
-            )
-            if not is_valid:
-                raise Exception(validation_error)
+            with self._phase(repo, CompactPhase.VERIFY):
+                is_valid, validation_error = validator.validate_post_compact(
+                    repo.commit_count, repo.branch_count, repo.tag_count
+                )
+                if not is_valid:
+                    raise Exception(validation_error)
 
             # Sucesso!
             repo.status = RepoStatus.COMPACTED
@@ -451,6 +971,18 @@ class Compactor:
             if not self.keep_backup:
                 self.backup_manager.remove_backup(bundle_path)
 
+        except CompactAborted as e:
+            # Outro processo pode estar usando o repositorio: nao restaurar
+            repo.status = RepoStatus.FAILED
+            repo.error_message = f"Interrompido: {e} | backup mantido em {bundle_path}"
+            repo.size_after = self._get_git_size(repo)
+
+        except HookError as e:
+            # O git nao falhou: o repositorio fica como esta
+            repo.status = RepoStatus.FAILED
+            repo.error_message = f"{e} | backup mantido em {bundle_path}"
+            repo.size_after = self._get_git_size(repo)
+
         except Exception as e:
             repo.error_message = str(e)
             restored = self.backup_manager.restore_backup(repo, bundle_path)
@@ -466,6 +998,41 @@ class Compactor:
 
         return repo
 
+    @contextmanager
+    def _phase(self, repo: GitRepository, phase: CompactPhase) -> Iterator[None]:
+        """Envolve uma fase com os hooks `before_phase`/`after_phase`.
+
+        Excecoes dos hooks viram `HookError` (exceto `CompactAborted`). Se a
+        fase falhou, um erro no `after_phase` vira nota da excecao original.
+        """
+        self._call_hook(self.hooks.before_phase, "before_phase", repo, phase)
+        try:
+            yield
+        except Exception as error:
+            try:
+                self._call_hook(self.hooks.after_phase, "after_phase", repo, phase)
+            except Exception as hook_error:
+                error.add_note(f"{hook_error} (apos a falha da fase)")
+            raise
+        self._call_hook(self.hooks.after_phase, "after_phase", repo, phase)
+
+    def _call_hook(
+        self,
+        hook: Callable[[GitRepository, CompactPhase], None] | None,
+        name: str,
+        repo: GitRepository,
+        phase: CompactPhase
+    ) -> None:
+        """Executa um hook, embrulhando falhas inesperadas em `HookError`."""
+        if hook is None:
+            return
+        try:
+            hook(repo, phase)
+        except CompactAborted:
+            raise
+        except Exception as e:
+            raise HookError(f"Falha no hook {name} da fase {phase.name}: {e}") from e
+
     def _get_git_size(self, repo: GitRepository) -> int:
         """Retorna o tamanho da pasta .git em bytes."""
         total = 0
@@ -547,6 +1114,10 @@ class CasaLogger:
     def error(self, text: str) -> None:
         self.logger.info(self._color("RED", f"[XX] {text}"))
 
+    def progress(self, text: str) -> None:
+        """Exibe linha de progresso."""
+        self.logger.info(self._color("CYAN", f"[..] {text}"))
+
     def commit_info(self, text: str) -> None:
         """Exibe info de auto-commit."""
         self.logger.info(self._color("BLUE", f"[>>] {text}"))
@@ -561,6 +1132,10 @@ class CasaLogger:
         if repo.auto_committed:
             self.commit_info(f"{name}: Auto-commit realizado")
 
+        if repo.compression:
+            c = repo.compression
+            self.info(f"{name}: compressao {c.level}, janela {c.window}, profundidade {c.depth}")
+
         match repo.status:
             case RepoStatus.COMPACTED:
                 self.success(f"{name}: {size_before} -> {size_after} (economia: {saved})")
@@ -571,6 +1146,45 @@ class CasaLogger:
             case _:
                 self.warning(f"{name}: Ignorado - {repo.error_message}")
 
+    def blob_report(self, report: BlobReport) -> None:
+        """Exibe o relatorio de blobs grandes de um repositorio."""
+        name = report.path.name
+        fmt = self._format_size
+
+        if report.total_blobs == 0 and report.error_message:
+            self.error(f"{name}: FALHA - {report.error_message}")
+            return
+
+        self.info(
+            f"{name}: {report.total_blobs} blobs, {fmt(report.total_blob_bytes)} "
+            f"({fmt(report.total_disk_bytes)} em disco)"
+        )
+        if report.error_message:
+            self.warning(f"{name}: {report.error_message}")
+
+        self.info("  Maiores blobs:")
+        for size, disk, sha, path in report.top_blobs:
+            self.info(f"    {fmt(size):>10}  {sha[:12]}  {path}")
+
+        self.info("  Caminhos que mais ocupam:")
+        for path, count, size, disk in report.top_paths:
+            self.info(f"    {fmt(disk):>10} em disco  {count:>6} versoes  {path}")
+
+        self.info("  Extensoes que mais ocupam:")
+        for ext, count, size, disk in report.top_extensions:
+            self.info(f"    {fmt(disk):>10} em disco  {count:>6} blobs  {ext}")
+
+        if report.lfs_extensions:
+            patterns = ",".join(f"*{ext}" for ext in report.lfs_extensions)
+            self.commit_info(
+                f"git lfs migrate import --everything --include=\"{patterns}\" "
+                f"economizaria ~{fmt(report.lfs_savings)}"
+            )
+        self.commit_info(
+            f"Clone parcial com --filter=blob:limit={report.threshold} "
+            f"economizaria ~{fmt(report.partial_clone_savings)}"
+        )
+
     def summary(self, summary: CompactSummary) -> None:
         """Exibe resumo final."""
         self.header("RESUMO FINAL")
@@ -600,33 +1214,618 @@ class CasaLogger:
         return f"{size_bytes:.1f} TB"
 
 
+# ============================================================================
+# PROGRESS TRACKER
+# ============================================================================
+
+class ProgressTracker:
+    """Acompanha o progresso do git, calcula ETA e detecta travamentos.
+
+    Recebe as linhas de progresso ja interpretadas pelo `GitCommandRunner`
+    (chamadas a partir da thread leitora) e as exibe no `CasaLogger` com no
+    maximo uma linha a cada `LOG_INTERVAL` segundos por fase. Enquanto um
+    comando com progresso roda (`watching`), uma thread de vigilancia avisa
+    quando ele fica `stall_seconds` sem avancar; fsck, contagens e calculo
+    de tamanho nao emitem progresso e por isso ficam fora da vigilancia.
+    """
+
+    LOG_INTERVAL = 10.0
+
+    def __init__(self, get_logger: Callable[[], CasaLogger], stall_seconds: int = 300):
+        self._get_logger = get_logger
+        self.stall_seconds = stall_seconds
+        self._lock = threading.Lock()
+        self._total = 0
+        self._done = 0
+        self._run_start = 0.0
+        self._name = ""
+        self._state: tuple[str, int | None, int] | None = None
+        self._phase_start = 0.0
+        self._last_change = 0.0
+        self._last_log = 0.0
+
+    @property
+    def logger(self) -> CasaLogger:
+        """Logger obtido so quando ha algo a exibir."""
+        return self._get_logger()
+
+    def start_run(self, total_repos: int) -> None:
+        """Inicia a contagem geral."""
+        self._total = total_repos
+        self._done = 0
+        self._run_start = time.monotonic()
+
+    def start_repo(self, repo: GitRepository) -> None:
+        """Inicia o acompanhamento de um repositorio."""
+        now = time.monotonic()
+        with self._lock:
+            self._name = repo.path.name
+            self._state = None
+            self._phase_start = now
+            self._last_change = now
+            self._last_log = 0.0
+
+    def finish_repo(self) -> None:
+        """Encerra o acompanhamento do repositorio atual."""
+        self._done += 1
+
+    @contextmanager
+    def watching(self) -> Iterator[None]:
+        """Vigia travamentos enquanto um comando com progresso roda."""
+        with self._lock:
+            self._last_change = time.monotonic()
+        stop = threading.Event()
+        watchdog = threading.Thread(target=self._watch, args=(stop,), daemon=True)
+        watchdog.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            watchdog.join()
+
+    def update(self, phase: str, percent: int | None, done: int) -> None:
+        """Registra uma linha de progresso do git."""
+        now = time.monotonic()
+        with self._lock:
+            previous = self._state
+            if previous == (phase, percent, done):
+                return
+            self._state = (phase, percent, done)
+            self._last_change = now
+
+            new_phase = previous is None or previous[0] != phase
+            if new_phase:
+                self._phase_start = now
+            finished = percent == 100
+            if not (new_phase or finished or now - self._last_log >= self.LOG_INTERVAL):
+                return
+            self._last_log = now
+            text = self._describe(phase, percent, done, now)
+
+        self.logger.progress(text)
+
+    def _describe(self, phase: str, percent: int | None, done: int, now: float) -> str:
+        """Monta a linha de progresso com ETA da fase e geral."""
+        parts = [f"{self._name}: {phase}"]
+        if percent is None:
+            parts.append(f"{done}")
+        else:
+            parts.append(f"{percent}%")
+            elapsed = now - self._phase_start
+            if 0 < percent < 100:
+                parts.append(f"ETA fase {self._format_eta(elapsed * (100 - percent) / percent)}")
+
+        if self._total:
+            parts.append(f"geral {self._done}/{self._total}")
+            if self._done:
+                average = (now - self._run_start) / self._done
+                parts.append(f"ETA geral {self._format_eta(average * (self._total - self._done))}")
+        return " | ".join(parts)
+
+    def _watch(self, stop: threading.Event) -> None:
+        """Avisa quando o progresso fica parado alem do limite."""
+        warned_at = 0.0
+        while not stop.wait(min(self.stall_seconds, 5)):
+            with self._lock:
+                idle = time.monotonic() - self._last_change
+                name, state = self._name, self._state
+            if idle >= self.stall_seconds and idle - warned_at >= self.stall_seconds:
+                warned_at = idle
+                where = f" em '{state[0]}'" if state else ""
+                self.logger.warning(f"{name}: sem progresso ha {self._format_eta(idle)}{where} (possivel travamento)")
+            elif idle < warned_at:
+                warned_at = 0.0
+
+    def _format_eta(self, seconds: float) -> str:
+        """Formata segundos como 1h02m, 3m05s ou 12s."""
+        seconds = int(seconds)
+        if seconds >= 3600:
+            return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+        if seconds >= 60:
+            return f"{seconds // 60}m{seconds % 60:02d}s"
+        return f"{seconds}s"
+
+
+# ============================================================================
+# FILA DISTRIBUIDA
+# ============================================================================
+
+class JobQueue:
+    """Fila de jobs em SQLite compartilhada entre coordenador e workers.
+
+    Cada job e um repositorio. Workers reivindicam jobs com um lease que e
+    renovado enquanto a compactacao roda; se o worker morrer, o lease expira
+    e outro worker assume o job. O journal padrao (DELETE) e usado porque o
+    modo WAL nao funciona em volumes de rede (NFS/SMB).
+    """
+
+    MAX_ATTEMPTS = 3
+    MIN_LEASE_SECONDS = 30
+
+    def __init__(self, queue_path: Path):
+        self.queue_path = queue_path
+
+    def _connect(self) -> "sqlite3.Connection":
+        """Abre uma conexao nova (uma por operacao, segura entre threads)."""
+        import sqlite3
+
+        conn = sqlite3.connect(str(self.queue_path), timeout=60, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def initialize(self, settings: dict, repos: list[GitRepository]) -> None:
+        """Recria a fila com as configuracoes e os repositorios informados."""
+        self.queue_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DROP TABLE IF EXISTS jobs")
+            conn.execute("DROP TABLE IF EXISTS settings")
+            conn.execute("CREATE TABLE settings (data TEXT NOT NULL)")
+            conn.execute(
+                """
+                CREATE TABLE jobs (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    worker TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    reported INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute("INSERT INTO settings (data) VALUES (?)", (json.dumps(settings),))
+            conn.executemany(
+                "INSERT INTO jobs (path) VALUES (?)",
+                [(str(repo.path),) for repo in repos]
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def settings(self) -> dict:
+        """Retorna as configuracoes gravadas pelo coordenador."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT data FROM settings").fetchone()
+            return json.loads(row["data"]) if row else {}
+        finally:
+            conn.close()
+
+    def claim(self, worker_id: str, lease_seconds: int) -> tuple[int, GitRepository] | None:
+        """Reivindica o proximo job livre ou com lease expirado."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            while True:
+                row = conn.execute(
+                    """
+                    SELECT id, path, attempts FROM jobs
+                    WHERE state = 'pending' OR (state = 'running' AND lease_expires < ?)
+                    ORDER BY id LIMIT 1
+                    """,
+                    (now,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                if row["attempts"] >= self.MAX_ATTEMPTS:
+                    repo = GitRepository(
+                        path=Path(row["path"]),
+                        status=RepoStatus.FAILED,
+                        error_message=f"Lease expirou {row['attempts']} vezes sem resultado"
+                    )
+                    conn.execute(
+                        "UPDATE jobs SET state = 'done', result = ? WHERE id = ?",
+                        (json.dumps(self._encode(repo)), row["id"])
+                    )
+                    continue
+
+                conn.execute(
+                    """
+                    UPDATE jobs SET state = 'running', worker = ?, lease_expires = ?,
+                        attempts = attempts + 1
+                    WHERE id = ?
+                    """,
+                    (worker_id, now + lease_seconds, row["id"])
+                )
+                conn.execute("COMMIT")
+                return row["id"], GitRepository(path=Path(row["path"]))
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def renew(self, job_id: int, worker_id: str, lease_seconds: int) -> bool:
+        """Renova o lease de um job; falha se outro worker ja o assumiu."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET lease_expires = ?
+                WHERE id = ? AND worker = ? AND state = 'running'
+                """,
+                (time.time() + lease_seconds, job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def complete(self, job_id: int, worker_id: str, repo: GitRepository) -> bool:
+        """Publica o resultado de um job reivindicado por este worker."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET state = 'done', result = ?
+                WHERE id = ? AND worker = ? AND state = 'running'
+                """,
+                (json.dumps(self._encode(repo)), job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def unfinished(self) -> int:
+        """Conta jobs ainda nao concluidos."""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM jobs WHERE state != 'done'").fetchone()[0]
+        finally:
+            conn.close()
+
+    def total(self) -> int:
+        """Conta todos os jobs da fila."""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        finally:
+            conn.close()
+
+    def take_results(self) -> list[tuple[int, GitRepository]]:
+        """Retorna os resultados concluidos ainda nao lidos e os marca como lidos.
+
+        Os jobs terminam em qualquer ordem, entao o controle e feito pela
+        coluna `reported` e nao pelo id.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT id, result FROM jobs WHERE state = 'done' AND reported = 0 ORDER BY id"
+            ).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET reported = 1 WHERE id = ?",
+                [(row["id"],) for row in rows]
+            )
+            conn.execute("COMMIT")
+            return [(row["id"], self._decode(json.loads(row["result"]))) for row in rows]
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _encode(self, repo: GitRepository) -> dict:
+        """Serializa o resultado de um repositorio."""
+        return {
+            "path": str(repo.path),
+            "size_before": repo.size_before,
+            "size_after": repo.size_after,
+            "status": repo.status.name,
+            "error_message": repo.error_message,
+            "commit_count": repo.commit_count,
+            "branch_count": repo.branch_count,
+            "tag_count": repo.tag_count,
+            "auto_committed": repo.auto_committed,
+            "compression": vars(repo.compression) if repo.compression else None,
+        }
+
+    def _decode(self, data: dict) -> GitRepository:
+        """Reconstroi um repositorio a partir do resultado serializado."""
+        return GitRepository(
+            path=Path(data["path"]),
+            size_before=data["size_before"],
+            size_after=data["size_after"],
+            status=RepoStatus[data["status"]],
+            error_message=data["error_message"],
+            commit_count=data["commit_count"],
+            branch_count=data["branch_count"],
+            tag_count=data["tag_count"],
+            auto_committed=data["auto_committed"],
+            compression=CompressionSettings(**data["compression"]) if data.get("compression") else None,
+        )
+
+
+class QueueWorker:
+    """Consome jobs da fila e executa a compactacao.
+
+    Se o lease de um job for perdido (outro worker pode ter assumido o
+    repositorio), a compactacao e interrompida antes da proxima fase sem
+    restaurar o backup.
+    """
+
+    POLL_INTERVAL = 2.0
+    RETRY_INTERVAL = 5.0
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        logger: CasaLogger,
+        lease_seconds: int = 900,
+        progress: ProgressTracker | None = None
+    ):
+        self.queue = queue
+        self.logger = logger
+        self.lease_seconds = lease_seconds
+        self.progress = progress
+        self._lease_lost = threading.Event()
+        import socket
+
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+    def run(self) -> CompactSummary:
+        """Processa jobs ate a fila esvaziar."""
+        settings = self.queue.settings()
+        backup_path = settings.get("backup_path")
+        compactor = Compactor(
+            BackupManager(Path(backup_path) if backup_path else None),
+            keep_backup=settings.get("keep_backup", False),
+            dry_run=settings.get("dry_run", False),
+            auto_commit=settings.get("auto_commit", True),
+            tuner=CompressionTuner(
+                settings.get("cpu_budget", 600.0), settings.get("retune", False)
+            ) if settings.get("auto_tune") else None,
+            progress=self.progress,
+            hooks=CompactHooks(before_phase=self._check_lease)
+        )
+        skip_remote_check = settings.get("skip_remote_check", False)
+
+        self.logger.info(f"Worker {self.worker_id} usando fila {self.queue.queue_path}")
+        summary = CompactSummary()
+        if self.progress:
+            self.progress.start_run(self.queue.total())
+
+        while self.queue.unfinished() > 0:
+            job = self.queue.claim(self.worker_id, self.lease_seconds)
+            if job is None:
+                time.sleep(self.POLL_INTERVAL)
+                continue
+
+            job_id, repo = job
+            self.logger.info(f"\n[job {job_id}] Processando: {repo.path}")
+
+            self._lease_lost.clear()
+            stop = threading.Event()
+            heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, stop), daemon=True)
+            heartbeat.start()
+            if self.progress:
+                self.progress.start_repo(repo)
+            try:
+                repo = compactor.compact(repo, skip_remote_check)
+            finally:
+                if self.progress:
+                    self.progress.finish_repo()
+                stop.set()
+                heartbeat.join()
+
+            if not self.queue.complete(job_id, self.worker_id, repo):
+                self.logger.warning(f"{repo.path.name}: lease perdido, resultado descartado")
+                continue
+
+            self.logger.repo_result(repo)
+            summary.total_repos += 1
+            summary.add(repo)
+
+        return summary
+
+    def _check_lease(self, repo: GitRepository, phase: CompactPhase) -> None:
+        """Hook: impede a proxima fase se o lease foi perdido."""
+        if self._lease_lost.is_set():
+            raise CompactAborted(f"lease perdido antes da fase {phase.name}")
+
+    def _heartbeat(self, job_id: int, stop: threading.Event) -> None:
+        """Renova o lease periodicamente enquanto o job roda.
+
+        Erros na renovacao (ex.: banco travado no NFS) sao repetidos ate o
+        lease vencer; a partir dai o lease e considerado perdido.
+        """
+        last_renewal = time.monotonic()
+        interval = self.lease_seconds / 3
+        while not stop.wait(interval):
+            try:
+                renewed = self.queue.renew(job_id, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                if time.monotonic() - last_renewal >= self.lease_seconds:
+                    self.logger.warning(f"[job {job_id}] lease perdido: {e}")
+                    self._lease_lost.set()
+                    return
+                interval = min(self.RETRY_INTERVAL, self.lease_seconds / 3)
+                continue
+
+            if not renewed:
+                self.logger.warning(f"[job {job_id}] lease assumido por outro worker")
+                self._lease_lost.set()
+                return
+            last_renewal = time.monotonic()
+            interval = self.lease_seconds / 3
+
+
+class DistributedCoordinator:
+    """Enfileira repositorios e consolida os resultados dos workers."""
+
+    POLL_INTERVAL = 2.0
+
+    def __init__(self, config: CompactConfig, logger: CasaLogger):
+        self.config = config
+        self.logger = logger
+        self.queue = JobQueue(config.queue_path)
+
+    def run(self, repos: list[GitRepository]) -> CompactSummary:
+        """Publica os jobs, dispara workers locais e aguarda a conclusao."""
+        settings = {
+            "backup_path": str(self.config.backup_path) if self.config.backup_path else None,
+            "keep_backup": self.config.keep_backup,
+            "dry_run": self.config.dry_run,
+            "auto_commit": self.config.auto_commit,
+            "skip_remote_check": self.config.skip_remote_check,
+            "auto_tune": self.config.auto_tune,
+            "retune": self.config.retune,
+            "cpu_budget": self.config.cpu_budget,
+        }
+        self.queue.initialize(settings, repos)
+        self.logger.info(f"Fila: {self.config.queue_path} ({len(repos)} jobs)")
+
+        workers = [self._spawn_worker() for _ in range(self.config.local_workers)]
+        if not workers:
+            self.logger.info("Aguardando workers externos...")
+
+        summary = CompactSummary(total_repos=len(repos))
+        done = 0
+        try:
+            while True:
+                for _, repo in self.queue.take_results():
+                    done += 1
+                    self.logger.info(f"\n[{done}/{len(repos)}] Concluido: {repo.path}")
+                    self.logger.repo_result(repo)
+                    summary.add(repo)
+
+                if done >= len(repos):
+                    break
+
+                if workers and all(w.poll() is not None for w in workers):
+                    self.logger.error("Todos os workers locais encerraram antes do fim da fila")
+                    summary.failed += len(repos) - done
+                    break
+
+                time.sleep(self.POLL_INTERVAL)
+        finally:
+            for worker in workers:
+                worker.wait()
+
+        return summary
+
+    def _spawn_worker(self) -> subprocess.Popen:
+        """Inicia um processo worker local apontando para a mesma fila."""
+        cmd = [
+            sys.executable, str(Path(__file__).resolve()),
+            "--worker",
+            "--queue", str(self.config.queue_path),
+            "--lease-seconds", str(self.config.lease_seconds),
+            "--spawned-worker",
+        ]
+        if self.config.progress:
+            cmd += ["--progress", "--stall-timeout", str(self.config.stall_seconds)]
+        return subprocess.Popen(cmd)
+
+
 # ============================================================================
 # MAIN APPLICATION
 # ============================================================================
 
 class CasaGitCompactApp:
-    """Aplicacao principal que orquestra a compactacao."""
+    """Aplicacao principal que orquestra a compactacao.
+
+    Alem do `run` usado pela CLI, pode ser usada como biblioteca via
+    `iter_compact`, que compacta uma lista de caminhos no mesmo processo.
+    O `CasaLogger` so e criado (e o logging configurado) quando necessario.
+    """
 
-    def __init__(self, config: CompactConfig):
+    def __init__(
+        self,
+        config: CompactConfig,
+        hooks: CompactHooks | None = None,
+        logger: CasaLogger | None = None
+    ):
         self.config = config
-        self.logger = CasaLogger(config.log_file)
+        self._logger = logger
         self.scanner = RepositoryScanner(config.exclude_patterns)
         self.backup_manager = BackupManager(config.backup_path)
+        self.progress = ProgressTracker(lambda: self.logger, config.stall_seconds) if config.progress else None
         self.compactor = Compactor(
             self.backup_manager,
             keep_backup=config.keep_backup,
             dry_run=config.dry_run,
-            auto_commit=config.auto_commit
+            auto_commit=config.auto_commit,
+            tuner=CompressionTuner(config.cpu_budget, config.retune) if config.auto_tune else None,
+            progress=self.progress,
+            hooks=hooks
         )
 
+    @property
+    def logger(self) -> CasaLogger:
+        """Logger da aplicacao, criado no primeiro uso."""
+        if self._logger is None:
+            self._logger = CasaLogger(self.config.log_file)
+        return self._logger
+
+    def iter_compact(self, paths: Iterable[Path | str]) -> Iterator[GitRepository]:
+        """Compacta cada caminho e devolve o resultado assim que termina.
+
+        Nao busca repositorios nem escreve no log, exceto as linhas de
+        progresso quando `config.progress` esta ativo (passe um `logger`
+        proprio para controlar a saida); caminhos que nao sao repositorios
+        Git sao devolvidos com status FAILED.
+        """
+        if self.progress:
+            self.progress.start_run(len(paths) if hasattr(paths, "__len__") else 0)
+
+        for path in paths:
+            repo = GitRepository(path=Path(path))
+            if not repo.git_dir.is_dir():
+                repo.status = RepoStatus.FAILED
+                repo.error_message = "Nao e um repositorio Git"
+                yield repo
+                continue
+            yield self._compact_one(repo)
+
     def run(self) -> CompactSummary:
         """Executa a compactacao em todos os repositorios."""
+        if self.config.worker:
+            self.logger.header("CASA GIT COMPACT - WORKER")
+            worker = QueueWorker(
+                JobQueue(self.config.queue_path), self.logger, self.config.lease_seconds, self.progress
+            )
+            summary = worker.run()
+            if not self.config.spawned_worker:
+                self.logger.summary(summary)
+            return summary
+
         self.logger.banner()
         self.logger.header("CASA GIT COMPACT")
         self.logger.info(f"Pasta raiz: {self.config.root_path}")
         self.logger.info(f"Dry-run: {'Sim' if self.config.dry_run else 'Nao'}")
         self.logger.info(f"Manter backups: {'Sim' if self.config.keep_backup else 'Nao'}")
         self.logger.info(f"Auto-commit: {'Sim' if self.config.auto_commit else 'Nao'}")
+        if self.config.auto_tune:
+            self.logger.info(f"Auto-tune: Sim (orcamento de CPU: {self.config.cpu_budget:.0f}s)")
 
         self.logger.info("\nBuscando repositorios...")
         repos = self.scanner.scan(self.config.root_path)
@@ -636,31 +1835,50 @@ class CasaGitCompactApp:
             self.logger.warning("Nenhum repositorio encontrado!")
             return CompactSummary()
 
+        if self.config.analyze:
+            return self._run_analysis(repos)
+
+        if self.config.queue_path:
+            summary = DistributedCoordinator(self.config, self.logger).run(repos)
+            self.logger.summary(summary)
+            return summary
+
         summary = CompactSummary(total_repos=len(repos))
+        if self.progress:
+            self.progress.start_run(len(repos))
 
         for i, repo in enumerate(repos, 1):
             self.logger.info(f"\n[{i}/{len(repos)}] Processando: {repo.path}")
 
-            repo = self.compactor.compact(repo, self.config.skip_remote_check)
+            repo = self._compact_one(repo)
             self.logger.repo_result(repo)
+            summary.add(repo)
 
-            summary.total_size_before += repo.size_before
-            summary.total_size_after += repo.size_after
+        self.logger.summary(summary)
+        return summary
 
-            if repo.auto_committed:
-                summary.auto_committed += 1
+    def _compact_one(self, repo: GitRepository) -> GitRepository:
+        """Compacta um repositorio acompanhando o progresso, se ativo."""
+        if self.progress:
+            self.progress.start_repo(repo)
+        try:
+            return self.compactor.compact(repo, self.config.skip_remote_check)
+        finally:
+            if self.progress:
+                self.progress.finish_repo()
+
+    def _run_analysis(self, repos: list[GitRepository]) -> CompactSummary:
+        """Gera o relatorio de blobs grandes sem alterar os repositorios."""
+        analyzer = BlobAnalyzer(self.config.analyze_top, self.config.blob_threshold)
+        summary = CompactSummary(total_repos=len(repos))
 
-            match repo.status:
-                case RepoStatus.COMPACTED:
-                    summary.compacted += 1
-                case RepoStatus.RESTORED:
-                    summary.restored += 1
-                case RepoStatus.FAILED:
-                    summary.failed += 1
-                case _:
-                    summary.skipped += 1
+        for i, repo in enumerate(repos, 1):
+            self.logger.info(f"\n[{i}/{len(repos)}] Analisando: {repo.path}")
+            report = analyzer.analyze(repo)
+            self.logger.blob_report(report)
+            if report.total_blobs == 0 and report.error_message:
+                summary.failed += 1
 
-        self.logger.summary(summary)
         return summary
 
 
@@ -670,6 +1888,8 @@ class CasaGitCompactApp:
 
 def parse_args() -> CompactConfig:
     """Parse argumentos da linha de comando."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="CASA GIT COMPACT - Compacta repositorios Git com seguranca.",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -679,14 +1899,18 @@ Exemplos:
   python casa_git_compact.py -p /home/user/repos --dry-run
   python casa_git_compact.py -p . --keep-backup --backup-path D:\\Backups
   python casa_git_compact.py -p . --no-auto-commit
+  python casa_git_compact.py -p . --auto-tune --cpu-budget 300
+  python casa_git_compact.py -p . --progress --stall-timeout 600
+  python casa_git_compact.py -p . --analyze --top 10 --blob-threshold 5
+  python casa_git_compact.py -p /mnt/repos --queue /mnt/repos/fila.db --workers 4
+  python casa_git_compact.py --worker --queue /mnt/repos/fila.db
         """
     )
 
     parser.add_argument(
         "-p", "--path",
         type=Path,
-        required=True,
-        help="Pasta raiz para buscar repositorios"
+        help="Pasta raiz para buscar repositorios (obrigatorio exceto com --worker)"
     )
     parser.add_argument(
         "--backup-path",
@@ -725,10 +1949,99 @@ Exemplos:
         help="Arquivo de log"
     )
 
+    parser.add_argument(
+        "--queue",
+        type=Path,
+        help="Arquivo SQLite da fila compartilhada (modo distribuido)"
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Rodar como worker consumindo jobs da fila (requer --queue)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Workers locais iniciados pelo coordenador (padrao: 0, so externos)"
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=int,
+        default=900,
+        help="Duracao do lease de cada job em segundos (padrao: 900)"
+    )
+
+    parser.add_argument(
+        "--auto-tune",
+        action="store_true",
+        help="Escolher compressao por repositorio com repacks de teste"
+    )
+    parser.add_argument(
+        "--retune",
+        action="store_true",
+        help="Refazer o auto-tune mesmo se ja houver configuracao gravada"
+    )
+    parser.add_argument(
+        "--cpu-budget",
+        type=float,
+        default=600.0,
+        help="Segundos de CPU estimados aceitos por repack no auto-tune (padrao: 600)"
+    )
+
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="Apenas analisar os blobs que ocupam espaco (nao compacta)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Quantidade de itens em cada ranking da analise (padrao: 20)"
+    )
+    parser.add_argument(
+        "--blob-threshold",
+        type=float,
+        default=1.0,
+        help="Tamanho em MB a partir do qual um blob e considerado grande (padrao: 1)"
+    )
+
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Exibir progresso do git (repack/gc/bundle) com ETA"
+    )
+    parser.add_argument(
+        "--stall-timeout",
+        type=int,
+        default=300,
+        help="Segundos sem progresso ate avisar possivel travamento (padrao: 300)"
+    )
+
+    parser.add_argument(
+        "--spawned-worker",
+        action="store_true",
+        help=argparse.SUPPRESS
+    )
+
     args = parser.parse_args()
 
+    if args.stall_timeout < 1:
+        parser.error("--stall-timeout deve ser pelo menos 1 segundo")
+    if args.top < 1:
+        parser.error("--top deve ser pelo menos 1")
+    if args.blob_threshold <= 0:
+        parser.error("--blob-threshold deve ser maior que zero")
+    if args.lease_seconds < JobQueue.MIN_LEASE_SECONDS:
+        parser.error(f"--lease-seconds deve ser pelo menos {JobQueue.MIN_LEASE_SECONDS} segundos")
+    if args.worker and not args.queue:
+        parser.error("--worker requer --queue")
+    if not args.worker and not args.path:
+        parser.error("o argumento -p/--path e obrigatorio")
+
     return CompactConfig(
-        root_path=args.path.resolve(),
+        root_path=args.path.resolve() if args.path else Path.cwd(),
         backup_path=args.backup_path.resolve() if args.backup_path else None,
         keep_backup=args.keep_backup,
         dry_run=args.dry_run,
@@ -736,6 +2049,19 @@ Exemplos:
         exclude_patterns=args.exclude,
         log_file=args.log_file.resolve() if args.log_file else None,
         auto_commit=not args.no_auto_commit,
+        queue_path=args.queue.resolve() if args.queue else None,
+        worker=args.worker,
+        spawned_worker=args.spawned_worker,
+        local_workers=args.workers,
+        lease_seconds=args.lease_seconds,
+        progress=args.progress,
+        stall_seconds=args.stall_timeout,
+        analyze=args.analyze,
+        analyze_top=args.top,
+        blob_threshold=int(args.blob_threshold * 1024 * 1024),
+        auto_tune=args.auto_tune,
+        retune=args.retune,
+        cpu_budget=args.cpu_budget,
     )
 
 